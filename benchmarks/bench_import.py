@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+"""Benchmark of the import time of the smpgrph module.
+
+Imports smpgrph in fresh interpreters and reports the median time the
+import took. Exits with status 1 if the median exceeds the given limit
+or if one of the lazily loaded modules got imported along with smpgrph,
+so the script can guard against import time regressions.
+
+The bytecode cache is written by a first import and used by the
+measured ones, as for installed code. With --no-cache the modules are
+compiled on every import instead, which mostly measures their size.
+This is only reported and not checked against a limit unless --max-ms
+is given.
+
+Usage: python benchmarks/bench_import.py [--runs N] [--max-ms MS]
+                                         [--no-cache]
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Modules which must only be imported by the functions using them.
+LAZY_MODULES = ["xlrd", "smtplib", "multiprocessing", "future", "past",
+                "random", "array", "copy"]
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, timeit
+before = set(sys.modules)
+t = timeit.default_timer()
+import smpgrph
+t = timeit.default_timer() - t
+print(t)
+print(",".join(set(sys.modules) - before))
+"""
+
+def measure_import(runs, cache=True):
+    """ Import smpgrph in runs fresh interpreters.
+
+    Returns a tuple of the sorted import times in seconds and the set
+    of modules imported along with smpgrph.
+
+    runs: number of fresh interpreters to import in.
+    cache: boolean to indicate if the bytecode cache is used.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, "-c", PROBE]
+    if cache:
+        subprocess.check_output(command, cwd=REPO_DIR, env=env)
+    else:
+        # Don't write bytecode and look for it where none can exist.
+        command.insert(1, "-B")
+        env["PYTHONPYCACHEPREFIX"] = os.devnull
+    times = []
+    loaded = set()
+    for i in range(runs):
+        out = subprocess.check_output(command, cwd=REPO_DIR, env=env)
+        seconds, modules = out.decode("utf-8").splitlines()[:2]
+        times.append(float(seconds))
+        loaded.update(m for m in modules.split(",") if m)
+    return sorted(times), loaded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20,
+                        help="number of fresh interpreters to import in")
+    parser.add_argument("--max-ms", type=float,
+                        help="limit for the median import time, default "
+                        "10 ms with the bytecode cache and none without")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="compile the modules on every import")
+    args = parser.parse_args()
+
+    maxMs = args.max_ms
+    if maxMs is None and not args.no_cache:
+        maxMs = 10.0
+
+    times, loaded = measure_import(args.runs, not args.no_cache)
+    median = times[len(times)//2] * 1000
+    eager = sorted(m for m in LAZY_MODULES if m in loaded)
+    print(json.dumps({"median_ms": round(median, 3),
+                      "min_ms": round(times[0] * 1000, 3),
+                      "max_ms": round(times[-1] * 1000, 3),
+                      "runs": args.runs,
+                      "cache": not args.no_cache,
+                      "eager_modules": eager}))
+    if eager:
+        print("Modules imported along with smpgrph: %s" % ", ".join(eager),
+              file=sys.stderr)
+        return 1
+    if maxMs is not None and median > maxMs:
+        print("Median import time %.3f ms exceeds %.3f ms"
+              % (median, maxMs), file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+"""Benchmark of the memory use and traversal speed of Node and Edge.
+
+Compares the slotted Node and Edge classes of smpgrph with plain
+classes keeping every attribute in a per instance dict, as Node and
+Edge did before. Reports the bytes allocated per node and per edge,
+the bytes added per node by setting the visited and distance
+attributes, as the algorithms of smpgrph do, and the time of a breadth
+first traversal reading and setting these attributes.
+
+Usage: python benchmarks/bench_objects.py [--nodes N] [--degree D]
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+import smpgrph
+
+class DictNode(object):
+    """ Node without slots, as smpgrph.Node was before.
+    """
+    def __init__(self, identifier):
+        self.identifier = identifier
+        self.neighbours = {}
+        self.edges = {}
+
+class DictEdge(object):
+    """ Edge without slots, as smpgrph.Edge was before.
+    """
+    def __init__(self, identifier, start, end, is_directed=False, weight=1):
+        self.identifier = identifier
+        self.start = start
+        self.end = end
+        self.is_directed = is_directed
+        self.weight = weight
+
+def build(node_cls, edge_cls, n, degree, seed=1):
+    """ Returns a dict of n linked nodes with about degree neighbours
+    each, a list of the edges and the bytes allocated for nodes and
+    edges.
+    """
+    rng = random.Random(seed)
+    names = ["".join(["n", str(i)]) for i in range(n)]
+    links = [(rng.randrange(n), rng.randrange(n))
+             for i in range(n * degree)]
+    gc.collect()
+    tracemalloc.start()
+    nodes = dict((name, node_cls(name)) for name in names)
+    nodeBytes = tracemalloc.get_traced_memory()[0]
+    edges = []
+    for a, b in links:
+        start = nodes[names[a]]
+        end = nodes[names[b]]
+        identifier = "".join([start.identifier, end.identifier, "1"])
+        edge = edge_cls(identifier, start, end)
+        start.neighbours[end.identifier] = 1
+        start.edges[edge.identifier] = edge
+        end.edges[edge.identifier] = edge
+        edges.append(edge)
+    edgeBytes = tracemalloc.get_traced_memory()[0] - nodeBytes
+    tracemalloc.stop()
+    return nodes, edges, nodeBytes, edgeBytes
+
+def traverse(nodes, start):
+    """ Breadth first traversal setting visited and distance.
+    """
+    for node in nodes.values():
+        node.visited = False
+        node.distance = float("inf")
+    first = nodes[start]
+    first.visited = True
+    first.distance = 0
+    queue = deque([first])
+    while queue:
+        node = queue.popleft()
+        for i in node.neighbours:
+            neighbour = nodes[i]
+            if not neighbour.visited:
+                neighbour.visited = True
+                neighbour.distance = node.distance + 1
+                queue.append(neighbour)
+
+def measure(node_cls, edge_cls, n, degree, repeat):
+    nodes, edges, nodeBytes, edgeBytes = build(node_cls, edge_cls, n,
+                                               degree)
+    start = next(iter(nodes))
+    # The first traversal adds the visited and distance attributes.
+    gc.collect()
+    tracemalloc.start()
+    traverse(nodes, start)
+    attrBytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    seconds = min(timeit.repeat(lambda: traverse(nodes, start),
+                                number=1, repeat=repeat))
+    return {"bytes_per_node": round(nodeBytes / n, 1),
+            "bytes_per_edge": round(edgeBytes / len(edges), 1),
+            "attribute_bytes_per_node": round(attrBytes / n, 1),
+            "bytes_per_visited_node": round((nodeBytes + attrBytes) / n, 1),
+            "traversal_seconds": round(seconds, 6)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--degree", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    results = {"nodes": args.nodes, "degree": args.degree}
+    results["dict"] = measure(DictNode, DictEdge, args.nodes, args.degree,
+                              args.repeat)
+    results["slots"] = measure(smpgrph.Node, smpgrph.Edge, args.nodes,
+                               args.degree, args.repeat)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
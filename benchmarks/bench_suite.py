@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+
+"""End-to-end benchmark suite of smpgrph on synthetic graphs.
+
+Measures graph construction with the generators of grphgen, add_edge
+and remove_edge, diff_color_neighbours, xmaselves, Table rendering and
+excel_to_table for a range of graph sizes. Every case is run --repeat
+times and the fastest run is reported. The results are written as JSON
+so that runs on different commits can be compared with --compare.
+
+excel_to_table reads generated edge tables with one row per node. They
+are written as .xls with xlwt, because current versions of xlrd only
+read .xls files. An .xls sheet holds at most 65536 rows, so larger sizes
+are recorded as skipped, as are all sizes if xlwt or xlrd is missing.
+
+Usage:
+  python benchmarks/bench_suite.py [--sizes 10,100,1000] [--output FILE]
+  python benchmarks/bench_suite.py --full --output results.json
+  python benchmarks/bench_suite.py --compare old.json new.json
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+import grphgen
+import smpgrph
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+FULL_SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+# Average degree of the Erdos-Renyi graphs.
+DEGREE = 4
+# Number of edges added and removed by the add_edge/remove_edge case.
+EDGE_OPS = 10000
+
+# Rows of an .xls sheet without the header row.
+XLS_MAX_ROWS = 65535
+
+timer = timeit.default_timer
+
+class Skip(Exception):
+    """ Raised by a case which can't run for a size, with the reason.
+    """
+
+def _er_graph(n, seed):
+    return grphgen.erdos_renyi(n, DEGREE / max(n - 1, 1), seed)
+
+def bench_construct_erdos_renyi(n, seed):
+    t = timer()
+    graph = _er_graph(n, seed)
+    return [("construct_erdos_renyi", timer() - t,
+             {"edges": len(graph.edges)})]
+
+def bench_construct_barabasi_albert(n, seed):
+    t = timer()
+    graph = grphgen.barabasi_albert(n, 2, seed)
+    return [("construct_barabasi_albert", timer() - t,
+             {"edges": len(graph.edges)})]
+
+def bench_construct_grid(n, seed):
+    side = int(round(n ** 0.5))
+    t = timer()
+    graph = grphgen.grid(side, side)
+    return [("construct_grid", timer() - t,
+             {"size": len(graph.nodes), "edges": len(graph.edges)})]
+
+def bench_add_remove_edge(n, seed):
+    graph = _er_graph(n, seed)
+    nodes = graph.nodes
+    names = list(nodes)
+    rng = random.Random(seed)
+    pairs = {}
+    # At most half of the missing edges, so that drawing pairs until an
+    # unconnected one is found stays fast on small graphs.
+    free = n * (n - 1) // 2 - len(graph.edges)
+    for i in range(min(EDGE_OPS, free // 2)):
+        a, b = rng.sample(names, 2)
+        while b in nodes[a].neighbours or (a, b) in pairs \
+                or (b, a) in pairs:
+            a, b = rng.sample(names, 2)
+        pairs[(a, b)] = True
+    pairs = [(nodes[a], nodes[b]) for a, b in pairs]
+    t = timer()
+    for a, b in pairs:
+        graph.add_edge(a, b)
+    added = timer() - t
+    t = timer()
+    for a, b in pairs:
+        graph.remove_edge(a, b)
+    removed = timer() - t
+    return [("add_edge", added, {"operations": len(pairs)}),
+            ("remove_edge", removed, {"operations": len(pairs)})]
+
+def bench_diff_color_neighbours(n, seed):
+    graph = _er_graph(n, seed)
+    colors = [str(i) for i in range(graph.max_degree() + 1)]
+    start = graph.nodes["n0"]
+    t = timer()
+    smpgrph.diff_color_neighbours(graph, start, list(colors),
+                                  print_result=False)
+    return [("diff_color_neighbours", timer() - t,
+             {"edges": len(graph.edges)})]
+
+def bench_xmaselves(n, seed):
+    graph = grphgen.complete_minus_partner(n)
+    edges = len(graph.edges)
+    failed = False
+    t = timer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            smpgrph.xmaselves(graph, random.Random(seed))
+        except ValueError:
+            failed = True
+    return [("xmaselves", timer() - t,
+             {"edges": edges, "failed": failed})]
+
+def bench_table_render(n, seed):
+    table = smpgrph.Table([["Node"] + ["n%d" % i for i in range(n)],
+                           ["Color"] + ["red"] * n,
+                           ["Comment"] + ["row %d" % i for i in range(n)]],
+                          True)
+    out = io.StringIO()
+    t = timer()
+    with contextlib.redirect_stdout(out):
+        table.printTable()
+    return [("table_render", timer() - t, {"rows": n})]
+
+def _write_xls(path, n):
+    """ Write an edge table of a cycle through n nodes as .xls file.
+    """
+    import xlwt
+    book = xlwt.Workbook()
+    sheet = book.add_sheet("edges")
+    for col, header in enumerate(["start", "end", "weight"]):
+        sheet.write(0, col, header)
+    for row in range(n):
+        sheet.write(row + 1, 0, "n%d" % row)
+        sheet.write(row + 1, 1, "n%d" % ((row + 1) % n))
+        sheet.write(row + 1, 2, 1)
+    book.save(path)
+
+def bench_excel_to_table(n, seed):
+    if n > XLS_MAX_ROWS:
+        raise Skip("an .xls sheet holds at most %d rows" % XLS_MAX_ROWS)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "edges%d.xls" % n)
+        try:
+            _write_xls(path, n)
+        except ImportError as e:
+            raise Skip(str(e))
+        t = timer()
+        try:
+            table = smpgrph.excel_to_table(path)
+        except ImportError as e:
+            raise Skip(str(e))
+        seconds = timer() - t
+    finally:
+        shutil.rmtree(directory)
+    return [("excel_to_table", seconds, {"rows": table.numRows})]
+
+CASES = [
+    (bench_construct_erdos_renyi, None),
+    (bench_construct_barabasi_albert, None),
+    (bench_construct_grid, None),
+    (bench_add_remove_edge, None),
+    (bench_diff_color_neighbours, None),
+    # Dense graph with about n * n edges, limited by --max-dense-size.
+    (bench_xmaselves, "dense"),
+    (bench_table_render, None),
+    (bench_excel_to_table, None),
+    ]
+
+def run_suite(sizes, repeat, seed, max_dense_size, log=sys.stderr):
+    results = []
+    for case, kind in CASES:
+        for n in sizes:
+            if kind == "dense" and n > max_dense_size:
+                continue
+            runs = {}
+            try:
+                for i in range(repeat):
+                    for name, seconds, extra in case(n, seed):
+                        if name not in runs or seconds < runs[name][0]:
+                            runs[name] = (seconds, extra)
+            except Skip as e:
+                name = case.__name__[len("bench_"):]
+                results.append({"case": name, "size": n,
+                                "skipped": str(e)})
+                log.write("%-28s %8d skipped: %s\n" % (name, n, e))
+                continue
+            for name, (seconds, extra) in runs.items():
+                # A case may record the size it actually used.
+                result = {"case": name, "size": n, "seconds": seconds,
+                          "repeat": repeat}
+                result.update(extra)
+                results.append(result)
+                log.write("%-28s %8d %12.6f s\n" % (name, result["size"],
+                                                    seconds))
+    return results
+
+def _metadata():
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR,
+            stderr=subprocess.STDOUT).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+def compare(old_path, new_path):
+    """ Print a table comparing the results of two runs of the suite.
+    """
+    def load(path):
+        with io.open(path) as f:
+            data = json.load(f)
+        return data, dict(((r["case"], r["size"]), r)
+                          for r in data["results"] if "seconds" in r)
+    oldData, old = load(old_path)
+    newData, new = load(new_path)
+    columns = [["Case"], ["Size"], ["Old s"], ["New s"], ["New/Old"]]
+    for key in sorted(set(old) & set(new)):
+        case, size = key
+        ratio = new[key]["seconds"] / old[key]["seconds"] \
+            if old[key]["seconds"] else float("inf")
+        for column, value in zip(columns, [
+                case, str(size), "%.6f" % old[key]["seconds"],
+                "%.6f" % new[key]["seconds"], "%.2f" % ratio]):
+            column.append(value)
+    print("Old: %s  New: %s" % (oldData["meta"]["commit"],
+                                newData["meta"]["commit"]))
+    smpgrph.Table(columns, True).printTable()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(__doc__.splitlines()[1:]))
+    parser.add_argument("--sizes",
+                        help="comma separated node counts, default %s"
+                        % ",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--full", action="store_true",
+                        help="use the sizes %s"
+                        % ",".join(map(str, FULL_SIZES)))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-dense-size", type=int, default=300,
+                        help="largest size of the dense xmaselves graph")
+    parser.add_argument("--output", help="file to write the JSON results "
+                        "to instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    sizes = DEFAULT_SIZES
+    if args.full:
+        sizes = FULL_SIZES
+    if args.sizes:
+        sizes = [int(size) for size in args.sizes.split(",")]
+    results = run_suite(sizes, args.repeat, args.seed, args.max_dense_size)
+    data = {"meta": _metadata(), "results": results}
+    text = json.dumps(data, indent=1)
+    if args.output:
+        with io.open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""Generators of synthetic Simplegraph objects for tests and benchmarks.
+
+All generators name their nodes "n0", "n1", ... and use a seeded
+random.Random instance where randomness is involved, so the same
+arguments always produce the same graph.
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+import math
+import random
+
+from smpgrph import Node, Simplegraph, Table, xmas_elves_graph
+
+def _empty_graph(n):
+    """ Returns a Simplegraph object with n unconnected nodes and the
+    list of the nodes.
+    """
+    graph = Simplegraph()
+    nodes = [Node("n%d" % i) for i in range(n)]
+    for node in nodes:
+        graph.add_node(node)
+    return graph, nodes
+
+def erdos_renyi(n, p, seed=None):
+    """ Returns an undirected Erdos-Renyi random graph G(n, p).
+
+    Every pair of nodes is connected with probability p. Uses the
+    geometric skipping method of Batagelj and Brandes, so the graph is
+    generated in time linear in the number of nodes and edges.
+
+    n: number of nodes.
+    p: probability of an edge between two nodes.
+    seed: seed of the random number generator.
+    """
+    graph, nodes = _empty_graph(n)
+    if p <= 0:
+        return graph
+    if p >= 1:
+        for v in range(n):
+            for w in range(v):
+                graph.add_edge(nodes[v], nodes[w])
+        return graph
+    rng = random.Random(seed)
+    lp = math.log(1.0 - p)
+    v = 1
+    w = -1
+    while v < n:
+        w += 1 + int(math.log(1.0 - rng.random()) / lp)
+        while w >= v and v < n:
+            w -= v
+            v += 1
+        if v < n:
+            graph.add_edge(nodes[v], nodes[w])
+    return graph
+
+def barabasi_albert(n, m, seed=None):
+    """ Returns an undirected Barabasi-Albert preferential attachment
+    graph.
+
+    Starting from m unconnected nodes, every further node is connected
+    to m existing nodes chosen with a probability proportional to their
+    degree.
+
+    n: number of nodes.
+    m: number of edges added with every node.
+    seed: seed of the random number generator.
+    """
+    if m < 1 or m >= n:
+        raise ValueError("m needs to be at least 1 and smaller than n.")
+    rng = random.Random(seed)
+    graph, nodes = _empty_graph(n)
+    targets = list(range(m))
+    repeated = []
+    for source in range(m, n):
+        for target in targets:
+            graph.add_edge(nodes[source], nodes[target])
+        repeated.extend(targets)
+        repeated.extend([source] * m)
+        chosen = set()
+        targets = []
+        while len(targets) < m:
+            target = rng.choice(repeated)
+            if target not in chosen:
+                chosen.add(target)
+                targets.append(target)
+    return graph
+
+def grid(rows, columns):
+    """ Returns an undirected grid graph.
+
+    Every node is connected to its neighbours to the left, right, top
+    and bottom. The node in row r and column c is named
+    "n<r * columns + c>".
+
+    rows: number of rows.
+    columns: number of columns.
+    """
+    graph, nodes = _empty_graph(rows * columns)
+    for r in range(rows):
+        for c in range(columns):
+            node = nodes[r * columns + c]
+            if c + 1 < columns:
+                graph.add_edge(node, nodes[r * columns + c + 1])
+            if r + 1 < rows:
+                graph.add_edge(node, nodes[(r + 1) * columns + c])
+    return graph
+
+def complete_minus_partner(n):
+    """ Returns a graph set up like a X-mas elves arrangement.
+
+    Nodes are paired as partners (n0 with n1, n2 with n3, ...) and every
+    node is connected by a directed edge to every other node except its
+    partner, see xmas_elves_graph(). Every node has an email attribute.
+
+    n: number of nodes.
+    """
+    names = ["n%d" % i for i in range(n)]
+    emails = ["%s@example.org" % name for name in names]
+    partners = ["n%d" % (i ^ 1) if (i ^ 1) < n else "" for i in range(n)]
+    return xmas_elves_graph(Table([names, emails, partners]))
@@ -13,15 +13,20 @@ edges have no direction the same "weight" is used for both Nodes.
 #import essential modules, libraries and methods/functions
 from __future__ import (absolute_import, division,
                         print_function, unicode_literals)
-# To install builtins on windows: simply navigate to the
-# package future and type "setup.py install into the command line."
-from builtins import *
+import sys
+if sys.version_info[0] < 3:
+    # The future shims are only needed on python 2. To install builtins
+    # on windows: simply navigate to the package future and type
+    # "setup.py install into the command line."
+    from builtins import *
 import math
-import random
-import os
 
 from priodict import priorityDictionary
 
+# Modules only needed by some functions (random, array, os, copy,
+# multiprocessing, xlrd, smtplib) are imported where they are used to
+# keep the import of this module fast. See benchmarks/bench_import.py.
+
 #######################################################################
 # Define classes of this library
 
@@ -180,6 +185,16 @@ class SetupRoutinesTable(Table):
         self.numRows = len(data_list[0])
         self.data = setupTable(self, data_list)
 
+def _slotted_state(obj):
+    """ Returns a dict of all attributes of an object of a class with
+    __slots__, the ones in slots as well as the ones in its __dict__.
+    """
+    state = dict(getattr(obj, "__dict__", {}))
+    for name in type(obj).__slots__:
+        if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+            state[name] = getattr(obj, name)
+    return state
+
 class Node(object):
     """ Node object for use with a graph object.
 
@@ -189,16 +204,32 @@ class Node(object):
     the weight or cost of the edge connecting the Node with neighbour
     is the value.
 
+    The attributes identifier, neighbours, edges, visited, distance and
+    color are stored in slots. Further attributes can still be set and
+    end up in a per instance dict, which is only created when needed.
+    Note that node.__dict__ and vars(node) therefore only contain these
+    further attributes. Pickling and copying cover all attributes.
+
     identifier: string identifying the Node object.
     neighbours: dict of neighbouring Node objects.
     edges: dict with Edge objects connecting the Node object to its
       neighbours.
     """
+    __slots__ = ("identifier", "neighbours", "edges", "visited", "distance",
+                 "color", "__dict__", "__weakref__")
+
     def __init__(self, identifier):
         self.identifier = identifier
         self.neighbours = {}
         self.edges = {}
 
+    def __getstate__(self):
+        return _slotted_state(self)
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __str__(self):
         return "Node \"%s\" with neighbours: %s" % (self.identifier,
                                                     self.neighbours)
@@ -215,7 +246,13 @@ class Edge(object):
     end: Node object representing the end of the Edge object.
     is_directed: boolean to indicate if the edge is directed.
     weight: weight of the edge in the graph. E.g. distance or cost.
+
+    These attributes are stored in slots, further attributes in a per
+    instance dict. edge.__dict__ and vars(edge) only contain the latter.
     """
+    __slots__ = ("identifier", "start", "end", "is_directed", "weight",
+                 "__dict__", "__weakref__")
+
     def __init__(self, identifier, start, end, is_directed=False, weight=1):
         self.identifier = identifier
         self.start = start
@@ -232,6 +269,83 @@ class Edge(object):
     def __str__(self):
         return "Edge with identifier \"%s\"" % self.identifier
 
+    def __getstate__(self):
+        return _slotted_state(self)
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+def _node_attributes(node):
+    """ Returns a dict of the attributes of a Node object except its
+    identifier, neighbours and edges.
+    """
+    attrs = _slotted_state(node)
+    for name in ("identifier", "neighbours", "edges"):
+        attrs.pop(name, None)
+    return attrs
+
+def _edge_attributes(edge):
+    """ Returns a dict of the attributes of an Edge object set in
+    addition to identifier, start, end, is_directed and weight.
+    """
+    attrs = _slotted_state(edge)
+    for name in ("identifier", "start", "end", "is_directed", "weight"):
+        attrs.pop(name, None)
+    return attrs
+
+class DegreeIndex(object):
+    """ Index of the degrees of the Node objects in a graph.
+
+    Node identifiers are kept in buckets by degree, so the smallest and
+    largest degree and the nodes having them can be looked up in
+    constant time. The index is kept up to date by the Simplegraph
+    object owning it.
+
+    degrees: dict with the degree of every indexed Node identifier.
+    buckets: dict of degrees with a dict of the Node identifiers having
+      this degree as value. The inner dicts serve as ordered sets.
+    min: smallest degree in the index, None if the index is empty.
+    max: largest degree in the index, None if the index is empty.
+    """
+    def __init__(self):
+        self.degrees = {}
+        self.buckets = {}
+        self.min = None
+        self.max = None
+
+    def add(self, identifier, degree=0):
+        """ Add a Node identifier with the given degree to the index.
+        """
+        self.degrees[identifier] = degree
+        self.buckets.setdefault(degree, {})[identifier] = None
+        if self.min is None or degree < self.min:
+            self.min = degree
+        if self.max is None or degree > self.max:
+            self.max = degree
+
+    def change(self, identifier, delta):
+        """ Change the degree of a Node identifier by delta.
+
+        Runs in constant time for a delta of 1 or -1.
+        """
+        old = self.degrees[identifier]
+        new = old + delta
+        bucket = self.buckets[old]
+        del bucket[identifier]
+        if not bucket:
+            del self.buckets[old]
+        self.degrees[identifier] = new
+        self.buckets.setdefault(new, {})[identifier] = None
+        if new < self.min:
+            self.min = new
+        elif old == self.min and old not in self.buckets:
+            self.min = new if delta == 1 else min(self.buckets)
+        if new > self.max:
+            self.max = new
+        elif old == self.max and old not in self.buckets:
+            self.max = new if delta == -1 else max(self.buckets)
+
 class Simplegraph(object):
     """ Simple graph object to calculate graph algorithms with.
 
@@ -247,24 +361,101 @@ class Simplegraph(object):
       Edge objects.
     nodes: dict of Node objects belonging to the Simplegraph object.
     edges: dict of Edge objects belonging to the Simplegraph object.
+    degree_index: dict with a DegreeIndex object for each of the
+      degree modes "in", "out" and "total" queried so far. The index of
+      a mode is built on its first query and kept up to date by
+      add_node, add_edge and remove_edge from then on, so graphs which
+      are never queried don't pay for it. The out-degree of a Node
+      object is the number of its neighbours, the in-degree the number
+      of Node objects having it as neighbour.
+    node_ids: dict mapping the identifier of every Node object to an
+      integer id, numbering the nodes in the order they were added.
+    node_identifiers: list of the Node identifiers indexed by their
+      integer id.
     """
-    def __init__(self, attributes=AttributeTable(data_list = [[]]),
-                 setup_routines = SetupRoutinesTable(data_list = [[]])):
+    def __init__(self, attributes=None, setup_routines=None):
         self.nodes = {}
         self.edges = {}
+        self.node_ids = {}
+        self.node_identifiers = []
+        self.degree_index = {}
         if attributes is None:
-            attributes = Table(data_list = [[]])
+            attributes = AttributeTable(data_list = [[]])
         self.attributes = attributes
         if setup_routines is None:
-            setup_routines = Table(data_list = [[]])
+            setup_routines = SetupRoutinesTable(data_list = [[]])
         self.setup_routines = setup_routines
 
     def __str__(self):
         return "Graph object with nodes: %s" % self.nodes.keys()
 
+    def __getstate__(self):
+        """ Return a flat representation of the graph for pickling.
+
+        Node and Edge objects reference each other, so pickling them
+        recursively exceeds the recursion limit for graphs with a few
+        hundred nodes. Nodes and edges are therefore stored as lists of
+        plain records referencing each other by identifier.
+        """
+        edges = dict(self.edges)
+        nodes = []
+        for n in self.nodes.values():
+            nodes.append((n.identifier, _node_attributes(n),
+                          dict(n.neighbours),
+                          list(n.edges)))
+            edges.update(n.edges)
+        return {
+            "attributes": self.attributes,
+            "setup_routines": self.setup_routines,
+            "nodes": nodes,
+            "edges": [(e.identifier, e.start.identifier, e.end.identifier,
+                       e.is_directed, e.weight, _edge_attributes(e))
+                      for e in edges.values()],
+            "graph_edges": list(self.edges),
+            "degree_index": self.degree_index,
+            }
+
+    def __setstate__(self, state):
+        """ Rebuild the graph from the records of __getstate__().
+        """
+        self.attributes = state["attributes"]
+        self.setup_routines = state["setup_routines"]
+        self.nodes = {}
+        self.node_ids = {}
+        self.node_identifiers = []
+        for identifier, attrs, neighbours, edge_ids in state["nodes"]:
+            node = Node(identifier)
+            for name, value in attrs.items():
+                setattr(node, name, value)
+            node.neighbours = neighbours
+            self.nodes[node.identifier] = node
+            self._register_node_id(node.identifier)
+        edges = {}
+        for (identifier, start, end, is_directed, weight,
+             attrs) in state["edges"]:
+            edge = Edge(identifier, self.nodes[start], self.nodes[end],
+                        is_directed, weight)
+            for name, value in attrs.items():
+                setattr(edge, name, value)
+            edges[identifier] = edge
+        for identifier, attrs, neighbours, edge_ids in state["nodes"]:
+            self.nodes[identifier].edges = dict((i, edges[i])
+                                                for i in edge_ids)
+        self.edges = dict((i, edges[i]) for i in state["graph_edges"])
+        self.degree_index = state["degree_index"]
+
+    def __deepcopy__(self, memo):
+        import copy
+        graph = Simplegraph.__new__(Simplegraph)
+        graph.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        return graph
+
     def add_node(self, node):
         """ Add a node to the Graph object.
 
+        The node may already have neighbours, as long as they are part
+        of the graph or the node itself.
+
         node: node object to be added.
         """
         if not isinstance(node, Node):
@@ -273,7 +464,22 @@ class Simplegraph(object):
             print("Node %s already in graph. Skipping."
                   % node.identifier)
             return
+        for i in node.neighbours:
+            if i not in self.nodes and i != node.identifier:
+                raise ValueError("Neighbour %s of node %s is not part of "
+                                 "the graph." % (i, node.identifier))
         self.nodes[node.identifier] = node
+        self._register_node_id(node.identifier)
+        index = self.degree_index
+        if index:
+            for mode in index:
+                index[mode].add(node.identifier)
+            for i in node.neighbours:
+                self._change_degrees(node, self.nodes[i], 1)
+
+    def _register_node_id(self, identifier):
+        self.node_ids[identifier] = len(self.node_identifiers)
+        self.node_identifiers.append(identifier)
 
     def add_edge(self, start, end, weight=1, directed=False):
         """ Add an edge to the Graph object.
@@ -312,7 +518,7 @@ class Simplegraph(object):
             return
         # Reset weight and directed in case no argument is provided and
         # the function was called with arguments before.
-        if weight is None or weight is '':
+        if weight is None or weight == '':
             weight = 1
         if directed is None:
             directed = False
@@ -336,10 +542,12 @@ class Simplegraph(object):
 
         if end.identifier not in start.neighbours:
             start.neighbours[end.identifier] = weight
+            self._change_degrees(start, end, 1)
             newEdge = Edge(str(start.identifier + end.identifier
                                + str(weight)), start, end)
             if not directed and start.identifier not in end.neighbours:
                 end.neighbours[start.identifier] = weight
+                self._change_degrees(end, start, 1)
                 self.edges[newEdge.identifier] = newEdge
             else:
                 newEdge.is_directed = True
@@ -379,11 +587,125 @@ class Simplegraph(object):
 
         del self.nodes[startId].neighbours[endId] # unlink end from start
         del start.edges[edgeId] # remove reference to edge from start Node
+        self._change_degrees(start, end, -1)
         if not directed:
             del self.nodes[endId].neighbours[startId] # unlink start from end
             del end.edges[edgeId] # remove reference to edge from end Node
+            self._change_degrees(end, start, -1)
         del self.edges[edgeId] # remove reference to edge from Graph
 
+    def _change_degrees(self, start, end, delta):
+        """ Update the degree index for a link from start to end.
+        """
+        index = self.degree_index
+        if not index:
+            return
+        if "out" in index:
+            index["out"].change(start.identifier, delta)
+        if "in" in index:
+            index["in"].change(end.identifier, delta)
+        if "total" in index:
+            index["total"].change(start.identifier, delta)
+            index["total"].change(end.identifier, delta)
+
+    def _get_degree_index(self, mode):
+        """ Returns the DegreeIndex of mode, building it if needed.
+        """
+        index = self.degree_index.get(mode)
+        if index is not None:
+            return index
+        if mode not in ("in", "out", "total"):
+            raise ValueError("mode needs to be 'in', 'out' or 'total'.")
+        degrees = dict.fromkeys(self.nodes, 0)
+        if mode != "in":
+            for i, n in self.nodes.items():
+                degrees[i] += len(n.neighbours)
+        if mode != "out":
+            for n in self.nodes.values():
+                for i in n.neighbours:
+                    # Neighbours dicts set by hand may name Node
+                    # objects which are not part of the graph.
+                    if i in degrees:
+                        degrees[i] += 1
+        index = DegreeIndex()
+        for i, degree in degrees.items():
+            index.add(i, degree)
+        self.degree_index[mode] = index
+        return index
+
+    def degree(self, identifier, mode="out"):
+        """ Returns the degree of a Node object in the graph.
+
+        identifier: identifier of the Node object.
+        mode: "in", "out" or "total".
+        """
+        return self._get_degree_index(mode).degrees[identifier]
+
+    def degrees(self, identifiers=None, mode="out"):
+        """ Returns an array with the degrees of many Node objects.
+
+        identifiers: iterable of Node identifiers. Defaults to all Node
+          objects of the graph in the order of the nodes dict.
+        mode: "in", "out" or "total".
+        """
+        from array import array
+        degrees = self._get_degree_index(mode).degrees
+        if identifiers is None:
+            identifiers = self.nodes
+        return array("l", [degrees[i] for i in identifiers])
+
+    def min_degree(self, mode="out"):
+        """ Returns the smallest degree in the graph or None if the graph
+        has no nodes.
+
+        mode: "in", "out" or "total".
+        """
+        return self._get_degree_index(mode).min
+
+    def max_degree(self, mode="out"):
+        """ Returns the largest degree in the graph or None if the graph
+        has no nodes.
+
+        mode: "in", "out" or "total".
+        """
+        return self._get_degree_index(mode).max
+
+    def nodes_with_degree(self, degree, mode="out"):
+        """ Returns a list with the identifiers of the Node objects
+        having the given degree.
+
+        degree: the degree to look up.
+        mode: "in", "out" or "total".
+        """
+        return list(self._get_degree_index(mode).buckets.get(degree, ()))
+
+    def neighbours_of(self, identifiers=None):
+        """ Returns a list with a list of neighbour identifiers for
+        each of many Node objects.
+
+        identifiers: iterable of Node identifiers. Defaults to all Node
+          objects of the graph in the order of the nodes dict.
+        """
+        nodes = self.nodes
+        if identifiers is None:
+            identifiers = nodes
+        return [list(nodes[i].neighbours) for i in identifiers]
+
+    def neighbour_ids(self, identifiers=None):
+        """ Returns a list with an array of the integer ids of the
+        neighbours for each of many Node objects. See node_ids.
+
+        identifiers: iterable of Node identifiers. Defaults to all Node
+          objects of the graph in the order of the nodes dict.
+        """
+        from array import array
+        nodes = self.nodes
+        ids = self.node_ids
+        if identifiers is None:
+            identifiers = nodes
+        return [array("l", [ids[j] for j in nodes[i].neighbours])
+                for i in identifiers]
+
     def is_in_graph(self, node_or_edge):
         """ Returns True if Node or Edge object is part of the graph.
 
@@ -400,9 +722,10 @@ class Simplegraph(object):
             print("Wrong type provided. Use Node or Edge object as argument.")
 
     def print_adjacencylist(self):
-        for n in self.nodes.values():
-            print("%s: %s" % (n.identifier,
-                              [str(i) for i in n.neighbours.keys()]))
+        identifiers = list(self.nodes)
+        for i, neighbours in zip(identifiers,
+                                 self.neighbours_of(identifiers)):
+            print("%s: %s" % (i, [str(n) for n in neighbours]))
 
     def print_edges(self):
         edgeList = list(sorted(self.edges.keys()))
@@ -419,6 +742,90 @@ class Graphrelation(object):
     def __init__(self):
         pass
 
+class FifoFrontier(object):
+    """ First in first out frontier for graph_search(), resulting in a
+    breadth first search.
+
+    A Node identifier is only accepted once, later pushes of the same
+    identifier are ignored.
+    """
+    def __init__(self):
+        from collections import deque
+        self.queue = deque()
+        self.seen = set()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, key, cost):
+        """ Add key with cost. Returns True if key was accepted.
+        """
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.queue.append((key, cost))
+        return True
+
+    def pop(self):
+        """ Remove and return the oldest tuple (key, cost).
+        """
+        return self.queue.popleft()
+
+class LifoFrontier(object):
+    """ Last in first out frontier for graph_search(), resulting in a
+    depth first search.
+
+    Every push is accepted. graph_search() skips keys which were already
+    visited when they are popped again.
+    """
+    def __init__(self):
+        self.stack = []
+
+    def __len__(self):
+        return len(self.stack)
+
+    def push(self, key, cost):
+        """ Add key with cost. Returns True.
+        """
+        self.stack.append((key, cost))
+        return True
+
+    def pop(self):
+        """ Remove and return the newest tuple (key, cost).
+        """
+        return self.stack.pop()
+
+class PriorityFrontier(object):
+    """ Frontier for graph_search() returning the key with the lowest
+    cost first, resulting in a Dijkstra or best first search.
+
+    A push is only accepted if key is new or its cost is lower than the
+    cost key is stored with.
+    """
+    def __init__(self):
+        self.queue = priorityDictionary()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, key, cost):
+        """ Add key with cost. Returns True if key was accepted.
+        """
+        queue = self.queue
+        if key in queue and queue[key] <= cost:
+            return False
+        queue[key] = cost
+        return True
+
+    def pop(self):
+        """ Remove and return the tuple (key, cost) with lowest cost.
+        """
+        queue = self.queue
+        key = queue.smallest()
+        cost = queue[key]
+        del queue[key]
+        return key, cost
+
 """ Define functions and methods for this library
 """
 
@@ -436,31 +843,168 @@ def excel_to_table(excel_tbl, has_headers=True):
     if has_headers is None:
         has_headers = True
     filename, ext = os.path.splitext(excel_tbl)
-    if ext in ['xlsx', 'xls']:
+    if ext.lower() in ('.xlsx', '.xls'):
         ext = ""
     else:
         ext = ".xlsx"
     try:
         wb = openwb(excel_tbl + ext)
     except:
-        raise ValueError("""file needs to be xlsx or path specified
-                         including extension.""")
+        raise ValueError("couldn't open %s. The file needs to be xlsx "
+                         "or xls or its path given without extension."
+                         % (excel_tbl + ext))
     sheet = wb.sheets()[0]
     data_list = []
     for col in range(sheet.row_len(0)):
         data_list.append(sheet.col_values(col))
     return Table(data_list, has_headers)
 
-def setup_graph(node_table, edge_table):
+def csv_to_table(csv_tbl, has_headers=True):
+    """ Returns a Table object from a csv file.
+
+    csv_tbl: path to the csv file to convert
+    has_headers: boolean to indicate if the csv file contains a header
+      row
+    """
+    import csv
+    import io
+    if has_headers is None:
+        has_headers = True
+    # utf-8-sig drops the byte order mark Excel writes to csv files.
+    with io.open(csv_tbl, encoding="utf-8-sig", newline="") as f:
+        rows = [row for row in csv.reader(f) if row]
+    if not rows:
+        raise ValueError("csv file %s contains no data." % csv_tbl)
+    numColumns = max(len(row) for row in rows)
+    data_list = [[row[col] if col < len(row) else "" for row in rows]
+                 for col in range(numColumns)]
+    return Table(data_list, has_headers)
+
+def file_to_table(path, has_headers=True):
+    """ Returns a Table object from an excel workbook or a csv file,
+    depending on the extension of path.
+    """
+    import os
+    if os.path.splitext(path)[1].lower() == ".csv":
+        return csv_to_table(path, has_headers)
+    return excel_to_table(path, has_headers)
+
+def _cell_to_identifier(value):
+    """ Returns a table cell value as string usable as identifier.
+
+    Excel stores numbers as floats, so 1.0 is converted to "1".
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def setup_graph(node_table=None, edge_table=None, has_headers=True):
     """ Function to set up a Graph object.
 
-    name: name of the Graph object
-    node_table: a table of nodes (identifier needed, further attributes
-      welcome)
-    edge_table: a table of edges (identifier, start, end needed, weight
-      and direction optional)
+    Returns a Simplegraph object with a Node object for every row of
+    node_table and an edge for every row of edge_table. Nodes only
+    appearing in edge_table are added as well.
+
+    node_table: a table of nodes (identifier needed in the first column,
+      further columns are set as attributes named by the lower case
+      column header)
+    edge_table: a table of edges (columns with the headers start and end
+      needed, weight and directed optional)
+    has_headers: boolean to indicate if the tables were read with a
+      header row. If False the columns of edge_table are taken by
+      position in the order start, end, weight and directed.
     """
-    pass
+    graph = Simplegraph()
+
+    def get_node(identifier):
+        identifier = _cell_to_identifier(identifier)
+        if identifier not in graph.nodes:
+            graph.add_node(Node(identifier))
+        return graph.nodes[identifier]
+
+    if node_table is not None:
+        for row in range(node_table.numRows):
+            values = node_table.getValuesFromRow(row)
+            node = get_node(values[0])
+            for header, value in zip(node_table.headers[1:], values[1:]):
+                setattr(node, str(header).strip().lower(), value)
+    if edge_table is not None:
+        if has_headers:
+            names = [str(header).strip().lower()
+                     for header in edge_table.headers]
+        else:
+            names = ["start", "end", "weight", "directed"]
+        columns = dict((name, edge_table.getValuesFromColumn(col))
+                       for col, name in zip(range(edge_table.numColumns),
+                                            names))
+        if "start" not in columns or "end" not in columns:
+            raise ValueError("edge_table needs the columns start and end.")
+        for row in range(edge_table.numRows):
+            weight = 1
+            if "weight" in columns and columns["weight"][row] != "":
+                try:
+                    weight = float(columns["weight"][row])
+                except ValueError:
+                    raise ValueError("weight %r in row %d of edge_table "
+                                     "is not a number."
+                                     % (columns["weight"][row], row + 1))
+            directed = False
+            if "directed" in columns:
+                directed = (str(columns["directed"][row]).strip().lower()
+                            in ("1", "1.0", "true", "yes", "x"))
+            graph.add_edge(get_node(columns["start"][row]),
+                           get_node(columns["end"][row]), weight, directed)
+    return graph
+
+def xmas_elves_graph(table):
+    """ Returns a Simplegraph object set up for the xmaselves() algorithm.
+
+    Every person is connected by a directed edge to every other person
+    except to its partner.
+
+    table: Table object with the columns name, e-mail and partner of the
+      persons taking part.
+    """
+    graph = Simplegraph()
+    names = table.getValuesFromColumn(0)
+    emails = table.getValuesFromColumn(1)
+    partners = table.getValuesFromColumn(2)
+    for i in range(table.numRows):
+        elf = Node(names[i])
+        elf.email = emails[i]
+        elf.partner = partners[i]
+        graph.add_node(elf)
+    elves = graph.nodes.values()
+    for elf in elves:
+        for presentee in elves:
+            if (elf != presentee
+                and presentee.identifier != elf.partner):
+                graph.add_edge(elf, presentee, directed=True)
+    return graph
+
+def save_graph(graph, path):
+    """ Save a Simplegraph object to a binary file.
+
+    graph: the Simplegraph object to save.
+    path: path of the file to write.
+    """
+    import pickle
+    with open(path, "wb") as f:
+        pickle.dump(graph, f, pickle.HIGHEST_PROTOCOL)
+
+def load_graph(path):
+    """ Returns the Simplegraph object saved to path with save_graph().
+    """
+    import pickle
+    with open(path, "rb") as f:
+        try:
+            graph = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError):
+            raise ValueError("%s is not a file saved with save_graph()."
+                             % path)
+    if not isinstance(graph, Simplegraph):
+        raise ValueError("%s does not contain a Simplegraph object." % path)
+    return graph
 
 def relate_graphs(graph1, graph2, relation):
     """ Function to actually set the relation of two graphs. Makes
@@ -518,7 +1062,119 @@ Lieber Gruss\n\nDer automatische Wichtler" % (n.identifier, n.presentee)
 """ This section is used to define algorithms
 """
 
-def diff_color_neighbours(graph, start, colors=[]):
+def graph_search(graph, start, frontier=None, visit=None, stop=None,
+                 cost=None, expand=None):
+    """ Generic graph search shared by the algorithms of this library.
+
+    Takes Node identifiers from the frontier, visits each Node object
+    once and pushes its neighbours onto the frontier. The order of the
+    search is determined by the frontier: FifoFrontier for breadth
+    first, LifoFrontier for depth first and PriorityFrontier for
+    Dijkstra or best first search. Returns a tuple of two dicts (D, P):
+    D holds the cost of every visited Node identifier in the order of
+    the visits, P the identifier of the predecessor through which each
+    node was reached.
+
+    graph: the Simplegraph object to search.
+    start: identifier of the Node object to start from.
+    frontier: FifoFrontier (default), LifoFrontier or PriorityFrontier
+      object or any object with the same push, pop and __len__ methods.
+    visit: optional function called with the Node object and its cost
+      when a node is visited.
+    stop: optional predicate called with the Node object and its cost
+      after visit. The search ends when it returns True.
+    cost: optional function called with the cost of the visited node,
+      the Node object, the identifier of a neighbour and the weight of
+      the edge to it. Returns the cost of the neighbour. Defaults to the
+      cost of the node plus the weight.
+    expand: optional function called with the visited Node object
+      returning an iterable of tuples (identifier, weight) to push.
+      Defaults to the items of the neighbours dict of the node.
+    """
+    if frontier is None:
+        frontier = FifoFrontier()
+    nodes = graph.nodes
+    push = frontier.push
+    pop = frontier.pop
+    D = {}
+    P = {}
+    push(start, 0)
+    while len(frontier):
+        key, c = pop()
+        if key in D:
+            continue
+        D[key] = c
+        node = nodes[key]
+        if visit is not None:
+            visit(node, c)
+        if stop is not None and stop(node, c):
+            break
+        if expand is None:
+            links = node.neighbours.items()
+        else:
+            links = expand(node)
+        for i, weight in links:
+            if i in D:
+                continue
+            if cost is None:
+                if push(i, c + weight):
+                    P[i] = key
+            elif push(i, cost(c, node, i, weight)):
+                P[i] = key
+    return D, P
+
+def _count_hops(c, node, identifier, weight):
+    return c + 1
+
+def bfs(graph, start, visit=None, stop=None):
+    """ Breadth first search from a start node.
+
+    Returns the tuple (D, P) of graph_search() with the number of edges
+    from start as cost. The keys of D are in the order of the visits.
+
+    graph: the Simplegraph object to search.
+    start: identifier of the Node object to start from.
+    visit: optional function called with every visited Node object and
+      its cost.
+    stop: optional predicate ending the search, see graph_search().
+    """
+    return graph_search(graph, start, FifoFrontier(), visit, stop,
+                        _count_hops)
+
+def dfs(graph, start, visit=None, stop=None):
+    """ Depth first search from a start node.
+
+    Returns the tuple (D, P) of graph_search() with the depth in the
+    search tree as cost. The keys of D are in the order of the visits.
+
+    graph: the Simplegraph object to search.
+    start: identifier of the Node object to start from.
+    visit: optional function called with every visited Node object and
+      its cost.
+    stop: optional predicate ending the search, see graph_search().
+    """
+    return graph_search(graph, start, LifoFrontier(), visit, stop,
+                        _count_hops)
+
+def best_first(graph, start, goal, heuristic):
+    """ Greedy best first search from start to goal.
+
+    Always visits the node with the lowest heuristic value next.
+    Returns the tuple (D, P) of graph_search() with the heuristic values
+    as cost. Follow P back from goal to get the path found.
+
+    graph: the Simplegraph object to search.
+    start: identifier of the Node object to start from.
+    goal: identifier of the Node object to search for.
+    heuristic: function called with a Node object, returning the
+      estimated cost from this node to goal.
+    """
+    nodes = graph.nodes
+    return graph_search(graph, start, PriorityFrontier(),
+                        stop=lambda node, c: node.identifier == goal,
+                        cost=lambda c, node, i, weight: heuristic(nodes[i]))
+
+def diff_color_neighbours(graph, start, colors=[], print_result=True):
     """ Applies different colors to neighbours in a graph.
 
     A graph algorithm taking a Graph object and a starting Node object
@@ -528,6 +1184,7 @@ def diff_color_neighbours(graph, start, colors=[]):
      representing a neighbour relationship.
     start: the Node object to begin the algorithm with.
     colors: a list of colors to color the Node objects with.
+    print_result: boolean to indicate if the colors are printed.
     """
     if colors is None:  # Reset colors
         colors=[]
@@ -549,21 +1206,18 @@ def diff_color_neighbours(graph, start, colors=[]):
             n.distance = float('inf')
             n.color = None
 
-    def update_queue(g, queue, node):
-        """ Update queue with the neighbours of a Node object.
-
-        Subfunction in the diff_color_neighbours algorithm to update
-        the queue with the neighbours of a given node in a graph.
-        Checks if neighbours are already visited.
+    def color_node(node, distance):
+        """ Visit a Node object in the breadth first search.
 
-        g: graph running the algorithm on.
-        queue: the queue with unvisited Node objects in the graph.
-        node: the Node object whos neighbours get added to the queue
-         if they are unvisited.
+        Subfunction in the diff_color_neighbours algorithm. Marks the
+        node as visited, checks which colors are already applied to
+        its neighbours and assigns the first color of the residual
+        color list to the node.
         """
-        d = g.nodes
-        queue.extend([d[i].identifier for i in node.neighbours.keys()
-                      if not d[i].visited and d[i].identifier not in queue])
+        node.visited = True
+        node.distance = distance
+        n_colors = [graph.nodes[i].color for i in node.neighbours]
+        node.color = list(set(colors).difference(n_colors))[0]
 
     def print_diff_colors(g):
         """ Print the result of the algorithm for the given graph.
@@ -577,27 +1231,55 @@ def diff_color_neighbours(graph, start, colors=[]):
 
     init_dffclrnghbrs(graph, colors)
 
-    queue = [start.identifier]
+    # The actual algorithm: A breadth first search from start coloring
+    # every node when it's visited.
+    bfs(graph, start.identifier, color_node)
 
-    # The actual algorithm: Takes the first node in the queue,
-    # marks it as visited, checks which colors are already applied
-    # to the neighbours of the node, assigns the first color of the
-    # residual color list to the node, updates the queue and
-    # finally removes the actual node from the queue, to start the
-    # whole processes with the next node in the queue.
-    while len(queue) > 0:
-        node = graph.nodes[queue[0]]
-        node.visited = True
-
-        n_colors = [graph.nodes[i].color for i in node.neighbours]
-        node.color = list(set(colors).difference(n_colors))[0]
+    if print_result:
+        print_diff_colors(graph)
 
-        update_queue(graph, queue, node)
-        queue = queue[1:]
+def color_components(graph, colors=None):
+    """ Applies different colors to neighbours in all of a graph.
 
-    print_diff_colors(graph)
+    Like diff_color_neighbours(), but a new breadth first search is
+    started from every node left uncolored, so the nodes of every
+    component get a color. Each node gets the first color of colors
+    not used by its neighbours.
 
-def xmaselves(graph):
+    graph: the Simplegraph object to color.
+    colors: a list of colors to color the Node objects with. Defaults
+      to the numbers from 0 to the largest out-degree of the graph,
+      which are always enough.
+    """
+    if colors is None:
+        colors = list(range((graph.max_degree() or 0) + 1))
+    nodes = graph.nodes
+    for n in nodes.values():
+        n.visited = False
+        n.distance = float('inf')
+        n.color = None
+
+    def color_node(node, distance):
+        node.visited = True
+        node.distance = distance
+        used = set(nodes[i].color for i in node.neighbours)
+        for color in colors:
+            if color not in used:
+                node.color = color
+                return
+        raise ValueError("Not enough colors to color node %s."
+                         % node.identifier)
+
+    def unvisited(node):
+        return [(i, w) for i, w in node.neighbours.items()
+                if not nodes[i].visited]
+
+    for i, n in nodes.items():
+        if not n.visited:
+            graph_search(graph, i, FifoFrontier(), color_node,
+                         cost=_count_hops, expand=unvisited)
+
+def xmaselves(graph, rng=None):
     """ Randomly assign each node to only one connected node.
 
     A grpah algorithm which randomly removes edges between nodes in a
@@ -606,7 +1288,11 @@ def xmaselves(graph):
     Returns a list of tuples: (elf, presentee, email).
 
     graph: the Simplegraph object to run the algorithm on.
+    rng: optional random.Random instance to draw with. Defaults to the
+      global random module. Pass a seeded instance to reproduce a draw.
     """
+    if rng is None:
+        import random as rng
 
     def init_elves(graph):
         """ Initialise the graph for the problem to be solved.
@@ -619,12 +1305,12 @@ def xmaselves(graph):
     elves = graph.nodes.keys()
     init_elves(graph)
     d = dict(graph.nodes)
-    queue = [random.choice(list(d))]
+    queue = [rng.choice(list(d))]
     while len(queue) > 0:
         node = d[queue[0]]
         node.visited = True
         try:
-            node.presentee = random.choice(list(node.neighbours))
+            node.presentee = rng.choice(list(node.neighbours))
         except:
             node.presentee = ""
         for n in d.values():
@@ -641,6 +1327,8 @@ def xmaselves(graph):
                 print("couldn't remove %s from neighbours of %s"
                       % (n, node.identifier))
                 continue
+        # A scan is cheaper here than keeping the degree index up to
+        # date through the O(n^2) calls of remove_edge above.
         min_presentees = float('inf')
         for n in d.values():
             min_presentees = min(len(n.neighbours), min_presentees)
@@ -657,8 +1345,150 @@ def xmaselves(graph):
             raise ValueError("""Run led to node with no neighbours.
                              Please reexecute.""")
 
+def _elves_copy(graph):
+    """ Returns a copy of graph for a single xmaselves() draw.
 
-if __name__ == "__main__":
+    Only what xmaselves() changes is copied: the Node objects with
+    their neighbours and edges dicts and the edges dict of the graph.
+    The Edge objects and the tables are shared with graph, so the Edge
+    objects still reference the Node objects of graph. This is much
+    cheaper than copy.deepcopy(), which took several times as long as
+    the draw itself.
+    """
+    copy = Simplegraph.__new__(Simplegraph)
+    copy.__dict__.update(graph.__dict__)
+    copy.nodes = {}
+    for identifier, n in graph.nodes.items():
+        node = Node(identifier)
+        for name, value in _node_attributes(n).items():
+            setattr(node, name, value)
+        node.neighbours = dict(n.neighbours)
+        node.edges = dict(n.edges)
+        copy.nodes[identifier] = node
+    copy.edges = dict(graph.edges)
+    copy.degree_index = {}
+    return copy
+
+def _elves_draw(graph, seed):
+    """ Run xmaselves() with the given seed on a copy of graph.
+
+    Returns a tuple (seed, assignment) where assignment is a dict of
+    elf identifiers and their presentees or None if the draw failed.
+    """
+    import random
+    graph = _elves_copy(graph)
+    try:
+        xmaselves(graph, random.Random(seed))
+    except ValueError:
+        return seed, None
+    return seed, dict((n.identifier, n.presentee)
+                      for n in graph.nodes.values())
+
+_elves_graph = None
+
+def _init_elves_worker(graph):
+    """ Store the graph to draw from in a worker process of the pool.
+    """
+    global _elves_graph
+    _elves_graph = graph
+
+def _pooled_elves_draw(seed):
+    return _elves_draw(_elves_graph, seed)
+
+def xmaselves_batch(graph, runs, seed=None, processes=None, accept=None,
+                    chunksize=1):
+    """ Run many independent xmaselves() draws, optionally in parallel.
+
+    Every draw runs on its own copy of graph, which is left untouched,
+    with its own random.Random instance. The seeds of the draws are
+    derived from seed, so a batch as well as every single draw can be
+    reproduced: xmaselves(copy.deepcopy(graph), random.Random(s))
+    repeats the draw with seed s. Yields tuples (seed, assignment) in
+    the order of the draws. assignment is a dict mapping the identifier
+    of each elf to its presentee or None if the draw led to a node with
+    no neighbours.
+
+    graph: the Simplegraph object to draw from.
+    runs: number of draws.
+    seed: seed from which the seeds of the draws are derived.
+    processes: number of worker processes. None uses one process per
+      CPU, 1 runs the draws in the calling process.
+    accept: optional predicate called with every successful assignment.
+      The batch stops after the first draw it returns True for.
+    chunksize: number of draws sent to a worker process at once.
+    """
+    import random
+    master = random.Random(seed)
+    seeds = [master.randrange(2**32) for i in range(runs)]
+    pool = None
+    if processes == 1:
+        draws = (_elves_draw(graph, s) for s in seeds)
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes, _init_elves_worker, (graph,))
+        draws = pool.imap(_pooled_elves_draw, seeds, chunksize)
+    try:
+        for result in draws:
+            yield result
+            if (accept is not None and result[1] is not None
+                    and accept(result[1])):
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+def dijkstra(graph, start, end=None):
+    """ Find the shortest paths from a start node to all other nodes.
+
+    Dijkstra's algorithm using the weights of the edges as distances.
+    Returns a tuple of two dicts (D, P): D holds the distance from start
+    to every reachable Node identifier, P the identifier of the
+    predecessor on the shortest path to it. The search stops early once
+    the distance to end is known.
+
+    graph: the Simplegraph object to run the algorithm on.
+    start: identifier of the Node object to start from.
+    end: optional identifier of the Node object to stop at.
+    """
+    stop = None
+    if end is not None:
+        stop = lambda node, c: node.identifier == end
+    return graph_search(graph, start, PriorityFrontier(), stop=stop)
+
+def connected_components(graph):
+    """ Returns a list of the connected components of a graph.
+
+    Each component is a list of Node identifiers. The direction of the
+    edges is ignored, i.e. weakly connected components are returned for
+    directed graphs.
+
+    graph: the Simplegraph object to run the algorithm on.
+    """
+    linked = dict((i, list(n.neighbours.items()))
+                  for i, n in graph.nodes.items())
+    for i, n in graph.nodes.items():
+        for j, weight in n.neighbours.items():
+            if i not in graph.nodes[j].neighbours:
+                linked[j].append((i, weight))
+    components = []
+    seen = set()
+    for i in graph.nodes:
+        if i in seen:
+            continue
+        D, P = graph_search(
+            graph, i, cost=_count_hops,
+            expand=lambda node: linked[node.identifier])
+        seen.update(D)
+        components.append(list(D))
+    return components
+
+
+def demo():
+    """ Demonstrate the library on a small graph and the tables in the
+    inputtables directory.
+    """
+    import os
     A = Node("A")
     B = Node("B")
     C = Node("C")
@@ -716,28 +1546,244 @@ if __name__ == "__main__":
                                          'inputtables', 'testtbl'))
     newTab.printTable()
 
-    def setup_xmas_elves_graph():
-        print('xmas elves starting here')
-        xmasTab = excel_to_table(os.path.join(os.path.curdir,
-                                              'inputtables', 'wichtel'))
-        x = Simplegraph()
-        for i in range(xmasTab.numRows):
-            A = Node(xmasTab.getValuesFromColumn(0)[i])
-            A.email = xmasTab.getValuesFromColumn(1)[i]
-            A.partner = xmasTab.getValuesFromColumn(2)[i]
-            x.add_node(A)
-        elves = x.nodes.values()
-        for elf in elves:
-            for presentee in elves:
-                if (elf != presentee
-                    and presentee.identifier != elf.partner):
-                    x.add_edge(elf, presentee, directed=True)
-        return x
-
-    x = setup_xmas_elves_graph()
+    print('xmas elves starting here')
+    x = xmas_elves_graph(excel_to_table(os.path.join(os.path.curdir,
+                                                     'inputtables',
+                                                     'wichtel')))
     xmaselves(x)
     #xmas_elves_mail(x)
     for n in x.nodes.values():
         print("%s mit E-Mail %s ist Wichtel von %s."
         % (n.identifier, n.email, n.presentee))
-    
+
+""" This section is used to define the command line interface
+"""
+
+ALGORITHMS = {
+    "coloring": ["node", "color"],
+    "elves": ["seed", "elf", "presentee", "email"],
+    "shortest-paths": ["node", "distance", "predecessor"],
+    "components": ["node", "component"],
+    }
+
+def load_graph_file(path, node_path=None, algorithm=None,
+                    has_headers=True):
+    """ Returns a Simplegraph object loaded from a file.
+
+    Files with the extension .pickle, .pkl or .bin are loaded with
+    load_graph(). Excel and csv files are read as edge table for
+    setup_graph() or as table of persons for xmas_elves_graph() if
+    algorithm is "elves".
+
+    path: path of the graph file or edge table.
+    node_path: optional path of a node table for setup_graph().
+    algorithm: name of the algorithm the graph is loaded for.
+    has_headers: boolean to indicate if the tables have a header row.
+    """
+    import os
+    if os.path.splitext(path)[1].lower() in (".pickle", ".pkl", ".bin"):
+        return load_graph(path)
+    table = file_to_table(path, has_headers)
+    if algorithm == "elves":
+        return xmas_elves_graph(table)
+    node_table = None
+    if node_path is not None:
+        node_table = file_to_table(node_path, has_headers)
+    return setup_graph(node_table, table, has_headers)
+
+def run_algorithm(graph, algorithm, start=None, end=None, seed=None,
+                  runs=1, processes=None, colors=None):
+    """ Run an algorithm on graph and yield its result as dicts with the
+    fields listed in ALGORITHMS.
+
+    graph: the Simplegraph object to run the algorithm on.
+    algorithm: one of the keys of ALGORITHMS.
+    start: identifier of the Node object to start the shortest paths
+      from. Defaults to the first node of the graph.
+    end: optional identifier of the Node object to stop the shortest
+      paths search at.
+    seed: seed for the elves draws.
+    runs: number of elves draws. Draws which lead to a node without
+      neighbours are skipped.
+    processes: number of worker processes for the elves draws.
+    colors: optional list of colors for coloring, see color_components().
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError("algorithm needs to be one of %s."
+                         % ", ".join(sorted(ALGORITHMS)))
+    if start is None and graph.nodes:
+        start = next(iter(graph.nodes))
+    if algorithm == "coloring":
+        color_components(graph, colors)
+        for n in graph.nodes.values():
+            yield {"node": n.identifier, "color": n.color}
+    elif algorithm == "elves":
+        for seed, assignment in xmaselves_batch(graph, runs, seed,
+                                               processes):
+            if assignment is None:
+                continue
+            for elf, presentee in assignment.items():
+                yield {"seed": seed, "elf": elf, "presentee": presentee,
+                       "email": getattr(graph.nodes[elf], "email", "")}
+    elif algorithm == "shortest-paths":
+        D, P = dijkstra(graph, start, end)
+        for i in D:
+            yield {"node": i, "distance": D[i], "predecessor": P.get(i)}
+    elif algorithm == "components":
+        for number, component in enumerate(connected_components(graph)):
+            for i in component:
+                yield {"node": i, "component": number}
+
+def write_records(records, fields, out, fmt="jsonl"):
+    """ Write records to the file object out one at a time.
+
+    Returns the number of records written.
+
+    records: iterable of dicts.
+    fields: list of the fields of the records.
+    out: file object to write to.
+    fmt: "jsonl" for one JSON object per line or "csv".
+    """
+    import json
+    count = 0
+    if fmt == "csv":
+        import csv
+        writer = csv.DictWriter(out, fields, lineterminator="\n")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    else:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+def _peak_memory_kb(children=False):
+    """ Returns the peak resident memory of the process in KiB or None
+    where the resource module is not available.
+
+    children: boolean to return the peak of the largest child process
+      waited for instead, e.g. of the worker processes of a pool.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    who = resource.RUSAGE_SELF
+    if children:
+        who = resource.RUSAGE_CHILDREN
+    peak = resource.getrusage(who).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024
+    return peak
+
+def main(argv=None):
+    """ Command line entry point. Run with --help for the usage.
+
+    Unlike the rest of the module the command line needs Python 3.
+    """
+    if sys.version_info[0] < 3:
+        sys.exit("The command line of smpgrph needs Python 3.")
+    import argparse
+    import contextlib
+    import io
+    import json
+    import timeit
+    parser = argparse.ArgumentParser(
+        description="Load a graph and run an algorithm on it. Results "
+        "are streamed as JSON lines or csv, timing and memory are "
+        "reported as JSON on stderr.")
+    parser.add_argument("algorithm", choices=sorted(ALGORITHMS) + ["demo"])
+    parser.add_argument("input", nargs="?",
+                        help="graph file (.pickle, .pkl, .bin) or edge "
+                        "table (.xlsx, .xls, .csv) with the columns start, "
+                        "end and optionally weight and directed. For elves "
+                        "a table with name, e-mail and partner")
+    parser.add_argument("--nodes", help="optional node table")
+    parser.add_argument("--no-headers", action="store_true",
+                        help="the tables have no header row, the columns "
+                        "of an edge table are start, end, weight and "
+                        "directed in this order")
+    parser.add_argument("--start", help="start node of shortest-paths")
+    parser.add_argument("--end", help="end node of shortest-paths")
+    parser.add_argument("--colors", help="comma separated colors for "
+                        "coloring, default 0 to the largest degree")
+    parser.add_argument("--seed", type=int, help="seed of the elves draws")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="number of elves draws")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="worker processes for the elves draws")
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        default="jsonl")
+    parser.add_argument("--output", help="file to write the results to "
+                        "instead of stdout")
+    parser.add_argument("--save", help="save the loaded graph as binary "
+                        "file for faster loading")
+    args = parser.parse_args(argv)
+
+    if args.algorithm == "demo":
+        demo()
+        return 0
+    if args.input is None:
+        parser.error("input is required for %s" % args.algorithm)
+
+    timer = timeit.default_timer
+    t = timer()
+    try:
+        graph = load_graph_file(args.input, args.nodes, args.algorithm,
+                                not args.no_headers)
+    except (IOError, OSError, ValueError, ImportError) as e:
+        # ImportError if xlrd is missing for an Excel table.
+        sys.stderr.write("%s: error: %s\n" % (parser.prog, e))
+        return 1
+    loadSeconds = timer() - t
+    for option, identifier in (("--start", args.start), ("--end", args.end)):
+        if identifier is not None and identifier not in graph.nodes:
+            parser.error("%s: node %s is not in the graph."
+                         % (option, identifier))
+    colors = None
+    if args.colors:
+        colors = args.colors.split(",")
+    if args.save:
+        save_graph(graph, args.save)
+
+    out = sys.stdout
+    if args.output:
+        out = io.open(args.output, "w", newline="")
+    t = timer()
+    try:
+        # Algorithms print progress and warnings, keep them out of the
+        # results.
+        with contextlib.redirect_stdout(sys.stderr):
+            records = run_algorithm(graph, args.algorithm, args.start,
+                                    args.end, args.seed, args.runs,
+                                    args.processes, colors)
+            count = write_records(records, ALGORITHMS[args.algorithm],
+                                  out, args.format)
+    except ValueError as e:
+        sys.stderr.write("%s: error: %s\n" % (parser.prog, e))
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    runSeconds = timer() - t
+    sys.stderr.write(json.dumps({
+        "algorithm": args.algorithm,
+        "nodes": len(graph.nodes),
+        "edges": len(graph.edges),
+        "records": count,
+        "load_seconds": round(loadSeconds, 6),
+        "run_seconds": round(runSeconds, 6),
+        "peak_memory_kb": _peak_memory_kb(),
+        # The pool of the elves draws is joined by now.
+        "peak_worker_memory_kb": _peak_memory_kb(children=True),
+        }) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    # Run main() of the imported module, so that graphs saved with --save
+    # pickle smpgrph.Simplegraph instead of __main__.Simplegraph and can
+    # be loaded by the library as well.
+    import smpgrph
+    sys.exit(smpgrph.main())
@@ -0,0 +1,203 @@
+"""Tests of the degree index, the pickling and the setup of graphs.
+
+Run with: python -m pytest tests
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+import copy
+import os
+import pickle
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+import smpgrph
+from smpgrph import Node, Simplegraph
+
+MODES = ("in", "out", "total")
+
+def rebuilt_index(graph, mode):
+    """ Returns a DegreeIndex of mode built from scratch for graph.
+    """
+    fresh = Simplegraph.__new__(Simplegraph)
+    fresh.nodes = graph.nodes
+    fresh.degree_index = {}
+    return fresh._get_degree_index(mode)
+
+def index_state(index):
+    """ Returns the content of a DegreeIndex in comparable form.
+    """
+    buckets = dict((degree, set(bucket))
+                   for degree, bucket in index.buckets.items())
+    return index.degrees, buckets, index.min, index.max
+
+def adjacency(graph):
+    return dict((i, dict(n.neighbours)) for i, n in graph.nodes.items())
+
+class DegreeIndexTest(unittest.TestCase):
+
+    def assertIndexesRebuilt(self, graph):
+        for mode in MODES:
+            self.assertEqual(index_state(graph._get_degree_index(mode)),
+                             index_state(rebuilt_index(graph, mode)), mode)
+
+    def test_random_add_and_remove(self):
+        rng = random.Random(7)
+        graph = Simplegraph()
+        for i in range(5):
+            graph.add_node(Node("n%d" % i))
+        # Build the indexes so that they are maintained from now on.
+        for mode in MODES:
+            graph._get_degree_index(mode)
+        links = []
+        for step in range(2000):
+            names = list(graph.nodes)
+            action = rng.random()
+            if action < 0.1:
+                node = Node("n%d" % len(names))
+                for i in rng.sample(names, rng.randint(0, 3)):
+                    node.neighbours[i] = 1
+                graph.add_node(node)
+            elif action < 0.6 or not links:
+                start, end = rng.sample(names, 2)
+                directed = rng.random() < 0.5
+                if (end in graph.nodes[start].neighbours
+                        or start in graph.nodes[end].neighbours):
+                    continue
+                graph.add_edge(graph.nodes[start], graph.nodes[end],
+                               directed=directed)
+                links.append((start, end, directed))
+            else:
+                start, end, directed = links.pop(rng.randrange(len(links)))
+                graph.remove_edge(graph.nodes[start], graph.nodes[end],
+                                  directed)
+            if step % 50 == 0:
+                self.assertIndexesRebuilt(graph)
+        self.assertIndexesRebuilt(graph)
+
+    def test_add_node_with_neighbours(self):
+        graph = Simplegraph()
+        graph.add_node(Node("a"))
+        for mode in MODES:
+            graph._get_degree_index(mode)
+        node = Node("b")
+        node.neighbours["a"] = 1
+        graph.add_node(node)
+        self.assertEqual(list(graph.degrees(["a", "b"], "in")), [1, 0])
+        self.assertEqual(list(graph.degrees(["a", "b"], "out")), [0, 1])
+        self.assertEqual(list(graph.degrees(["a", "b"], "total")), [1, 1])
+        self.assertIndexesRebuilt(graph)
+
+    def test_add_node_with_unknown_neighbour(self):
+        graph = Simplegraph()
+        node = Node("b")
+        node.neighbours["a"] = 1
+        self.assertRaises(ValueError, graph.add_node, node)
+        self.assertNotIn("b", graph.nodes)
+
+    def test_unknown_neighbour_is_skipped(self):
+        graph = Simplegraph()
+        graph.add_node(Node("a"))
+        graph.nodes["a"].neighbours["gone"] = 1
+        self.assertEqual(graph.degree("a", "in"), 0)
+
+class PickleTest(unittest.TestCase):
+
+    def setUp(self):
+        graph = Simplegraph()
+        for i in range(4):
+            graph.add_node(Node("n%d" % i))
+        graph.add_edge(graph.nodes["n0"], graph.nodes["n1"], 2)
+        graph.add_edge(graph.nodes["n1"], graph.nodes["n2"], directed=True)
+        graph.add_edge(graph.nodes["n2"], graph.nodes["n3"])
+        graph.nodes["n0"].email = "n0@example.org"
+        graph.nodes["n1"].color = "red"
+        next(iter(graph.edges.values())).label = "first"
+        graph.degree("n0", "total")
+        self.graph = graph
+
+    def assertSameGraph(self, graph, copied):
+        self.assertEqual(adjacency(graph), adjacency(copied))
+        self.assertEqual(sorted(graph.edges), sorted(copied.edges))
+        for i, n in graph.nodes.items():
+            c = copied.nodes[i]
+            self.assertEqual(smpgrph._node_attributes(n),
+                             smpgrph._node_attributes(c))
+            self.assertEqual(sorted(n.edges), sorted(c.edges))
+            for e in c.edges.values():
+                self.assertIs(e, copied.edges.get(e.identifier, e))
+                self.assertIn(e.start.identifier, copied.nodes)
+                self.assertIs(copied.nodes[e.start.identifier], e.start)
+        for i, e in graph.edges.items():
+            c = copied.edges[i]
+            self.assertEqual((e.is_directed, e.weight),
+                             (c.is_directed, c.weight))
+            self.assertEqual(smpgrph._edge_attributes(e),
+                             smpgrph._edge_attributes(c))
+        self.assertEqual(list(graph.degrees(mode="total")),
+                         list(copied.degrees(mode="total")))
+        self.assertEqual(copied.node_ids, graph.node_ids)
+
+    def test_round_trip(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copied = pickle.loads(pickle.dumps(self.graph, protocol))
+            self.assertSameGraph(self.graph, copied)
+
+    def test_deepcopy(self):
+        self.assertSameGraph(self.graph, copy.deepcopy(self.graph))
+
+    def test_node_and_edge(self):
+        node = self.graph.nodes["n0"]
+        edge = next(iter(self.graph.edges.values()))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copied = pickle.loads(pickle.dumps(node, protocol))
+            self.assertEqual(smpgrph._slotted_state(copied).keys(),
+                             smpgrph._slotted_state(node).keys())
+            self.assertEqual(copied.email, node.email)
+            copied = pickle.loads(pickle.dumps(edge, protocol))
+            self.assertEqual(copied.label, edge.label)
+            self.assertEqual(copied.start.identifier, edge.start.identifier)
+
+class SetupGraphTest(unittest.TestCase):
+
+    def test_columns_by_header(self):
+        table = smpgrph.Table([["End", "b", "c"], ["start", "a", "b"],
+                               ["weight", "2", ""]], True)
+        graph = smpgrph.setup_graph(edge_table=table)
+        self.assertEqual(adjacency(graph), {"a": {"b": 2.0},
+                                            "b": {"a": 2.0, "c": 1},
+                                            "c": {"b": 1}})
+
+    def test_columns_by_position(self):
+        table = smpgrph.Table([["a", "b"], ["b", "c"], ["2", "3"],
+                               ["1", "0"]])
+        graph = smpgrph.setup_graph(edge_table=table, has_headers=False)
+        self.assertEqual(adjacency(graph), {"a": {"b": 2.0},
+                                            "b": {"c": 3.0},
+                                            "c": {"b": 3.0}})
+
+class CsvToTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "edges.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_byte_order_mark(self):
+        # Excel writes csv files as UTF-8 with a byte order mark.
+        with open(self.path, "wb") as f:
+            f.write(b"\xef\xbb\xbfstart,end\r\na,b\r\n")
+        table = smpgrph.csv_to_table(self.path)
+        self.assertEqual(table.headers, ["start", "end"])
+        graph = smpgrph.setup_graph(edge_table=table)
+        self.assertEqual(sorted(graph.nodes), ["a", "b"])
+
+if __name__ == "__main__":
+    unittest.main()